@@ -1,13 +1,19 @@
-from . import gemini, openai, anthropic, perplexity
+import importlib
 
+# Provider modules are imported on first use so the app starts without loading all of them.
 REGISTRY = {
-    "google": gemini,
-    "openai": openai,
-    "anthropic": anthropic,
-    "perplexity": perplexity
+    "google": "gemini",
+    "openai": "openai",
+    "anthropic": "anthropic",
+    "perplexity": "perplexity"
 }
+_LOADED = {}
 
 def get(provider_name: str):
     if provider_name not in REGISTRY:
         raise ValueError(f"Unknown provider: {provider_name}")
-    return REGISTRY[provider_name]
+    mod = _LOADED.get(provider_name)
+    if mod is None:
+        mod = importlib.import_module(f".{REGISTRY[provider_name]}", __name__)
+        _LOADED[provider_name] = mod
+    return mod
@@ -64,6 +64,12 @@ function buildTasksForRequest(singleOnly=false) {
   const pt = document.getElementById('promptTemplate').value.trim();
   const js = document.getElementById('jsonSchema').value.trim();
   const tasksJson = document.getElementById('tasksJson').value.trim();
+  const inputFieldsJson = document.getElementById('inputFields').value.trim();
+
+  let inputFields = null;
+  if (inputFieldsJson) {
+    try { inputFields = JSON.parse(inputFieldsJson); } catch (e) { alert('Input shaping JSON invalid'); return undefined; }
+  }
 
   const base = { file_id: FILE_ID, system_prompt: sys, max_output_tokens: maxOut, est_search_calls_per_row: searchCalls };
 
@@ -74,17 +80,24 @@ function buildTasksForRequest(singleOnly=false) {
       model: basicModel,
       prompt_template: pt,
       json_schema: js,
+      input_fields: inputFields,
       enable_web_search: enableSearch
     };
   }
 
   let tasks = [];
   try { tasks = JSON.parse(tasksJson); } catch (e) { alert('Tasks JSON invalid'); return null; }
+  // Input Shaping applies as the default for tasks without their own input_fields.
+  if (inputFields && Array.isArray(tasks)) {
+    tasks = tasks.map(t => (t && typeof t === 'object' && !t.input_fields) ? { ...t, input_fields: inputFields } : t);
+  }
   return { ...base, tasks };
 }
 
 async function estimate() {
-  const body = buildTasksForRequest(false) || buildTasksForRequest(true);
+  let body = buildTasksForRequest(false);
+  if (body === undefined) return;
+  body = body || buildTasksForRequest(true);
   if (!body) return;
   const res = await fetch('/api/estimate', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(body) });
   const data = await res.json();
@@ -93,7 +106,9 @@ async function estimate() {
 }
 
 async function preview() {
-  const body = buildTasksForRequest(false) || buildTasksForRequest(true);
+  let body = buildTasksForRequest(false);
+  if (body === undefined) return;
+  body = body || buildTasksForRequest(true);
   if (!body) return;
   const res = await fetch('/api/preview', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(body) });
   const data = await res.json();
@@ -103,9 +118,13 @@ async function preview() {
 
 async function runAll() {
   const outFormat = document.getElementById('outFormat').value;
-  const body = buildTasksForRequest(false) || buildTasksForRequest(true);
+  let body = buildTasksForRequest(false);
+  if (body === undefined) return;
+  body = body || buildTasksForRequest(true);
   if (!body) return;
   body['output_format'] = outFormat;
+  const passthrough = document.getElementById('passthroughCols').value.trim();
+  if (passthrough) body['passthrough_columns'] = passthrough.split(',').map(s => s.trim()).filter(Boolean);
   const res = await fetch('/api/run-all', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(body) });
   const data = await res.json();
   if (!res.ok) { document.getElementById('runAllOut').textContent = 'Error: ' + JSON.stringify(data, null, 2); return; }
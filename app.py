@@ -6,7 +6,7 @@ from dotenv import load_dotenv
 
 from processing import (
     parse_file, infer_headers, read_all_rows,
-    render_prompt_for_row, flatten_json_record, normalize_domain
+    render_prompt_for_row, flatten_json_record, normalize_domain, template_columns
 )
 from utils import (
     load_models_catalog, pick_model_info, estimate_row_cost, validate_json
@@ -22,13 +22,17 @@ os.makedirs(RESULT_DIR, exist_ok=True)
 
 CONCURRENCY = max(1, int(os.getenv("CONCURRENCY", "5")))
 MAX_OUTPUT_TOKENS = int(os.getenv("MAX_OUTPUT_TOKENS", "400"))
+CACHE_KEY_COLUMNS = ["website","url","site","homepage"]
 
 app = Flask(__name__)
 FILES = {}
+_MODELS_RESPONSE = {"catalog": None, "rows": None}
 
 @app.route("/api/models", methods=["GET"])
 def models():
     cat = load_models_catalog()
+    if _MODELS_RESPONSE["catalog"] is cat:
+        return jsonify({"models": _MODELS_RESPONSE["rows"]})
     rows = []
     for prov, models in cat.items():
         for mid, info in models.items():
@@ -43,6 +47,7 @@ def models():
                 "web_search": info.get("web_search", None),
                 "extra": {k:v for k,v in info.items() if k not in ["display_name","input_per_m","output_per_m","pricing_url","notes","capabilities","web_search"]}
             })
+    _MODELS_RESPONSE.update(catalog=cat, rows=rows)
     return jsonify({"models": rows})
 
 @app.route("/api/upload", methods=["POST"])
@@ -66,17 +71,117 @@ def upload():
 
     return jsonify({"file_id": file_id, "headers": headers, "n_rows": n_rows, "sample_first_row": sample})
 
+INPUT_FIELD_LIMITS = ["max_chars", "max_tokens"]
+INPUT_FIELD_FLAGS = ["strip_html", "collapse_whitespace"]
+
+def _is_multi_task(data):
+    tasks = data.get("tasks")
+    return bool(tasks and isinstance(tasks, list) and len(tasks) > 0)
+
+def _template_list(data):
+    if _is_multi_task(data):
+        return [t.get("prompt_template","") for t in data["tasks"]]
+    return [data.get("prompt_template","")]
+
+def _normalize_input_fields(input_fields, where):
+    """
+    Check an `input_fields` mapping from request JSON and coerce its limits to
+    non-negative ints. Raises ValueError with a user-facing message.
+    """
+    if input_fields is None:
+        return None
+    if not isinstance(input_fields, dict):
+        raise ValueError(f"{where}: input_fields must be an object mapping placeholder names to options")
+    out = {}
+    for name, opts in input_fields.items():
+        if not isinstance(opts, dict):
+            raise ValueError(f"{where}: input_fields[{name!r}] must be an object")
+        clean = {}
+        for k, v in opts.items():
+            if k in INPUT_FIELD_LIMITS:
+                if v is None:
+                    continue
+                try:
+                    if isinstance(v, bool) or (isinstance(v, float) and not v.is_integer()):
+                        raise ValueError(v)
+                    n = int(v)
+                except (TypeError, ValueError, OverflowError):
+                    raise ValueError(f"{where}: input_fields[{name!r}].{k} must be an integer")
+                if n < 0:
+                    raise ValueError(f"{where}: input_fields[{name!r}].{k} must be >= 0")
+                clean[k] = n
+            elif k in INPUT_FIELD_FLAGS:
+                clean[k] = bool(v)
+            else:
+                raise ValueError(f"{where}: input_fields[{name!r}] has unknown option {k!r}")
+        out[name] = clean
+    return out
+
+def _validate_input_fields(data):
+    """
+    Normalize `input_fields` in place for the request and each task (tasks without
+    their own fall back to the request-level value). Returns an error message or None.
+    """
+    try:
+        data["input_fields"] = _normalize_input_fields(data.get("input_fields"), "request")
+        if _is_multi_task(data):
+            for i, t in enumerate(data["tasks"]):
+                if isinstance(t, dict):
+                    own = _normalize_input_fields(t.get("input_fields"), f"tasks[{i}]")
+                    t["input_fields"] = data["input_fields"] if own is None else own
+    except ValueError as e:
+        return str(e)
+    return None
+
+def _columns_to_load(data, meta, extra=()):
+    """
+    Preflight: the columns referenced by the task templates (plus `extra`),
+    restricted to the file's headers.
+    Returns (columns_to_read, referenced_columns, missing_placeholders).
+    """
+    headers = meta["headers"]
+    referenced = []
+    for tpl in _template_list(data):
+        for c in template_columns(tpl):
+            if c not in referenced:
+                referenced.append(c)
+    wanted = set(referenced) | set(extra)
+    columns = [h for h in headers if h in wanted]
+    # keep at least one column so the row count survives column selection
+    if not columns and headers:
+        columns = headers[:1]
+    present = [c for c in referenced if c in headers]
+    missing = [c for c in referenced if c not in headers]
+    return columns, present, missing
+
+def _passthrough_columns(data, meta):
+    """
+    Input columns copied into the output. Defaults to all headers when not configured.
+    Raises ValueError for a malformed value or names that are not in the headers.
+    """
+    cols = data.get("passthrough_columns")
+    if cols is None:
+        return list(meta["headers"])
+    if isinstance(cols, str):
+        cols = [c.strip() for c in cols.split(",") if c.strip()]
+    if not isinstance(cols, list) or not all(isinstance(c, str) for c in cols):
+        raise ValueError("passthrough_columns must be a list of column names or a comma-separated string")
+    unknown = [c for c in cols if c not in meta["headers"]]
+    if unknown:
+        raise ValueError(f"passthrough_columns not found in file headers: {', '.join(unknown)}")
+    return cols
+
 def _render_tasks_from_request(data, first_row):
     """
     Two modes:
-      - Single-task: provider, model, prompt_template, json_schema
-      - Multi-task: tasks: [{name, provider, model, prompt_template, json_schema, enable_web_search, est_search_calls_per_row}]
+      - Single-task: provider, model, prompt_template, json_schema, input_fields
+      - Multi-task: tasks: [{name, provider, model, prompt_template, json_schema, input_fields, enable_web_search, est_search_calls_per_row}]
+    `input_fields` maps a placeholder (or "*") to {max_chars, max_tokens, strip_html, collapse_whitespace}.
     Returns list of tasks with rendered prompts for the given row.
     """
-    tasks = data.get("tasks")
-    if tasks and isinstance(tasks, list) and len(tasks) > 0:
+    if _is_multi_task(data):
         out = []
-        for t in tasks:
+        for t in data["tasks"]:
             prompt_template = t.get("prompt_template","")
             out.append({
                 "name": t.get("name") or t.get("model"),
@@ -85,7 +190,7 @@ def _render_tasks_from_request(data, first_row):
                 "enable_web_search": bool(t.get("enable_web_search", False)),
                 "est_search_calls_per_row": float(t.get("est_search_calls_per_row", 1.0)),
                 "json_schema": t.get("json_schema"),
-                "user_prompt": render_prompt_for_row(prompt_template, first_row),
+                "user_prompt": render_prompt_for_row(prompt_template, first_row, t.get("input_fields")),
             })
         return out
     else:
@@ -97,7 +202,7 @@ def _render_tasks_from_request(data, first_row):
             "enable_web_search": bool(data.get("enable_web_search", False)),
             "est_search_calls_per_row": float(data.get("est_search_calls_per_row", 1.0)),
             "json_schema": data.get("json_schema"),
-            "user_prompt": render_prompt_for_row(prompt_template, first_row),
+            "user_prompt": render_prompt_for_row(prompt_template, first_row, data.get("input_fields")),
         }]
 
 @app.route("/api/estimate", methods=["POST"])
@@ -107,8 +212,11 @@ def estimate():
     if not file_id: return jsonify({"error":"missing file_id"}), 400
     meta = FILES.get(file_id)
     if not meta: return jsonify({"error":"file not found"}), 404
+    err = _validate_input_fields(data)
+    if err: return jsonify({"error": err}), 400
 
-    rows = read_all_rows(meta["path"])
+    columns, referenced, missing = _columns_to_load(data, meta)
+    rows = read_all_rows(meta["path"], columns=columns)
     if not rows: return jsonify({"error":"no rows"}), 400
     first_row = rows[0]
 
@@ -139,6 +247,8 @@ def estimate():
         "per_row_total_usd": round(total_row, 6),
         "full_sheet_total_usd": round(n_rows * total_row, 4),
         "tasks": est,
+        "template_columns": referenced,
+        "missing_columns": missing,
         "first_row_prompt_preview": task_list[0]["user_prompt"][:2000]
     })
 
@@ -149,8 +259,11 @@ def preview():
     if not file_id: return jsonify({"error":"missing file_id"}), 400
     meta = FILES.get(file_id)
     if not meta: return jsonify({"error":"file not found"}), 404
+    err = _validate_input_fields(data)
+    if err: return jsonify({"error": err}), 400
 
-    rows = read_all_rows(meta["path"])
+    columns, _, _ = _columns_to_load(data, meta)
+    rows = read_all_rows(meta["path"], columns=columns)
     if not rows: return jsonify({"error":"no rows"}), 400
     first_row = rows[0]
     system_prompt = data.get("system_prompt","")
@@ -180,38 +293,45 @@ def run_all():
     if not file_id: return jsonify({"error":"missing file_id"}), 400
     meta = FILES.get(file_id)
     if not meta: return jsonify({"error":"file not found"}), 404
+    err = _validate_input_fields(data)
+    if err: return jsonify({"error": err}), 400
 
-    rows = read_all_rows(meta["path"])
+    try:
+        passthrough = _passthrough_columns(data, meta)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    columns, _, _ = _columns_to_load(data, meta, extra=passthrough + CACHE_KEY_COLUMNS)
+    rows = read_all_rows(meta["path"], columns=columns)
     n_rows = len(rows)
     if n_rows == 0: return jsonify({"error":"no rows"}), 400
 
     system_prompt = data.get("system_prompt","")
 
     tasks_cfg = data.get("tasks")
-    single_mode = not (tasks_cfg and isinstance(tasks_cfg, list) and len(tasks_cfg)>0)
-    if single_mode:
+    if not _is_multi_task(data):
         tasks_cfg = [{
             "name": data.get("task_name","task1"),
             "provider": data.get("provider","google"),
             "model": data.get("model","gemini-2.5-flash"),
             "enable_web_search": bool(data.get("enable_web_search", False)),
             "json_schema": data.get("json_schema"),
-            "prompt_template": data.get("prompt_template","")
+            "prompt_template": data.get("prompt_template",""),
+            "input_fields": data.get("input_fields")
         }]
 
     cache = {}
 
     def process_row(idx):
         row = rows[idx]
-        out = dict(row)
+        out = {c: row.get(c, "") for c in passthrough}
         for t in tasks_cfg:
             key = None
-            for k in ["website","url","site","homepage"]:
+            for k in CACHE_KEY_COLUMNS:
                 if k in row and row[k]:
                     key = f"{t['provider']}::{t['model']}::{normalize_domain(str(row[k]))}"
                     break
 
-            user_prompt = render_prompt_for_row(t.get("prompt_template",""), row)
+            user_prompt = render_prompt_for_row(t.get("prompt_template",""), row, t.get("input_fields"))
             schema = t["json_schema"] if isinstance(t["json_schema"], dict) else json.loads(t["json_schema"])
             provider = get_provider(t["provider"])
 
@@ -0,0 +1,40 @@
+"""
+Startup benchmark: measures cold `import app` time and time-to-first-request
+(/api/models) in fresh interpreter processes, the way a new worker would start.
+
+    python bench_startup.py [runs]
+"""
+import os, sys, json, statistics, subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+resp = app.app.test_client().get("/api/models")
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "first_request_ms": (t2 - t1) * 1000,
+    "total_ms": (t2 - t0) * 1000,
+    "status": resp.status_code,
+    "heavy_modules": sorted(m for m in ("pandas", "jsonschema", "requests") if m in sys.modules),
+}))
+"""
+
+def run_once():
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=HERE, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    samples = [run_once() for _ in range(runs)]
+    for k in ["import_ms", "first_request_ms", "total_ms"]:
+        vals = [s[k] for s in samples]
+        print(f"{k:>17}: median {statistics.median(vals):8.1f}  min {min(vals):8.1f}  max {max(vals):8.1f}")
+    print(f"    heavy modules loaded after first request: {samples[-1]['heavy_modules'] or 'none'}")
+
+if __name__ == "__main__":
+    main()
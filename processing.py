@@ -1,8 +1,14 @@
-import os, re, json
-import pandas as pd
+import os, re, json, html
 from urllib.parse import urlparse
 
+PLACEHOLDER_RE = re.compile(r"\{\{([^}]+)\}\}")
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b[^>]*>.*?(</\1\s*>|$)", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<!--.*?-->|</?[A-Za-z][^<>]*>", re.DOTALL)
+_WS_RE = re.compile(r"\s+")
+CHARS_PER_TOKEN = 4
+
 def parse_file(path: str):
+    import pandas as pd
     ext = os.path.splitext(path)[1].lower()
     if ext == ".csv":
         df = pd.read_csv(path, dtype=str).fillna("")
@@ -16,19 +22,88 @@ def parse_file(path: str):
 def infer_headers(df):
     return list(df.columns)
 
-def read_all_rows(path: str):
+def read_all_rows(path: str, columns=None):
+    """
+    Read every row as a dict. If `columns` is given, only those columns are
+    loaded (names not present in the file are ignored).
+    """
+    import pandas as pd
     ext = os.path.splitext(path)[1].lower()
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda c: c in wanted
     if ext == ".csv":
-        df = pd.read_csv(path, dtype=str).fillna("")
+        df = pd.read_csv(path, dtype=str, usecols=usecols).fillna("")
     else:
-        df = pd.read_excel(path, dtype=str).fillna("")
-    return [dict(row) for _, row in df.iterrows()]
+        df = pd.read_excel(path, dtype=str, usecols=usecols).fillna("")
+    return df.to_dict(orient="records")
+
+def template_columns(template: str) -> list:
+    """Column names referenced by {{placeholders}} in a template, in order of first use."""
+    seen = []
+    for m in PLACEHOLDER_RE.finditer(template or ""):
+        key = m.group(1).strip()
+        if key not in seen:
+            seen.append(key)
+    return seen
+
+def clean_value(value, strip_html: bool = False, collapse_whitespace: bool = False) -> str:
+    text = str(value)
+    if strip_html:
+        text = _SCRIPT_STYLE_RE.sub(" ", text)
+        text = html.unescape(_TAG_RE.sub(" ", text))
+    if collapse_whitespace:
+        text = _WS_RE.sub(" ", text).strip()
+    return text
+
+def truncate_text(text: str, max_chars: int | None = None, max_tokens: int | None = None,
+                  ellipsis: str = "…") -> str:
+    """
+    Trim text to max_chars and/or max_tokens (approximated as 4 chars/token),
+    cutting at a word boundary when one is reasonably close to the limit.
+    """
+    limits = []
+    if max_chars is not None:
+        limits.append(int(max_chars))
+    if max_tokens is not None:
+        limits.append(int(max_tokens) * CHARS_PER_TOKEN)
+    if not limits:
+        return text
+    limit = max(0, min(limits))
+    if len(text) <= limit:
+        return text
+    if limit <= len(ellipsis):
+        return text[:limit]
+    cut = text[:limit - len(ellipsis)]
+    if not text[len(cut)].isspace():
+        space = cut.rfind(" ")
+        if space > len(cut) // 2:
+            cut = cut[:space]
+    return cut.rstrip() + ellipsis
+
+def shape_value(value, opts: dict | None) -> str:
+    """Apply per-placeholder input shaping: strip_html, collapse_whitespace, max_chars, max_tokens."""
+    if not opts:
+        return str(value)
+    text = clean_value(value, strip_html=bool(opts.get("strip_html")),
+                       collapse_whitespace=bool(opts.get("collapse_whitespace")))
+    return truncate_text(text, max_chars=opts.get("max_chars"), max_tokens=opts.get("max_tokens"))
 
-def render_prompt_for_row(template: str, row: dict) -> str:
+def render_prompt_for_row(template: str, row: dict, input_fields: dict | None = None) -> str:
+    """
+    Substitute {{column}} placeholders with row values. `input_fields` maps a
+    placeholder name (or "*" for all placeholders) to shaping options; a
+    placeholder's own options override the "*" defaults.
+    """
+    input_fields = input_fields or {}
+    defaults = input_fields.get("*") or {}
     def repl(m):
         key = m.group(1).strip()
-        return str(row.get(key, m.group(0)))
-    return re.sub(r"\{\{([^}]+)\}\}", repl, template)
+        if key not in row:
+            return m.group(0)
+        return shape_value(row[key], {**defaults, **(input_fields.get(key) or {})})
+    return PLACEHOLDER_RE.sub(repl, template)
 
 def flatten_json_record(obj, parent_key="", sep="__"):
     items = []
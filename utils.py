@@ -1,11 +1,20 @@
-import os, json
-from jsonschema import Draft202012Validator
+import os, json, threading
 
 CATALOG_PATH = os.path.join(os.path.dirname(__file__), "models_catalog.json")
 
+# In-memory snapshot of models_catalog.json, reloaded only when the file changes on disk.
+_CATALOG = {"stamp": None, "data": None}
+_CATALOG_LOCK = threading.Lock()
+
 def load_models_catalog():
-    with open(CATALOG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    st = os.stat(CATALOG_PATH)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _CATALOG_LOCK:
+        if _CATALOG["stamp"] != stamp:
+            with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+                _CATALOG["data"] = json.load(f)
+            _CATALOG["stamp"] = stamp
+        return _CATALOG["data"]
 
 def pick_model_info(provider: str, model: str):
     catalog = load_models_catalog()
@@ -55,6 +64,7 @@ def estimate_row_cost(provider: str, model: str, input_tokens: int, output_token
     }
 
 def validate_json(instance, schema):
+    from jsonschema import Draft202012Validator
     try:
         validator = Draft202012Validator(schema)
         errors = sorted(validator.iter_errors(instance), key=lambda e: e.path)